@@ -5,9 +5,16 @@ import sys
 import logging
 from moviepy.config import change_settings
 from moviepy.editor import TextClip, CompositeVideoClip, ColorClip
-from scripts.upload_youtube import upload_video_to_youtube
+from scripts.pipeline_paralelo import Etapa, PipelineParalelo, RecursoPorThread
+from scripts.upload_youtube import criar_servico_youtube, upload_video_to_youtube
 from scripts.upload_tiktok import upload_video_to_tiktok
 
+# Workers por etapa e tentativas do pipeline (validados com scripts/teste_carga.py)
+WORKERS = {"video": 1, "upload_youtube": 1, "upload_tiktok": 1}
+TENTATIVAS = 3
+BACKOFF_BASE_S = 2.0
+TIMEOUT_UPLOAD_S = 300
+
 def configurar_logging():
     logging.basicConfig(
         level=logging.INFO,
@@ -30,7 +37,8 @@ def criar_video(tema):
     logging.info(f"Vídeo criado em: {video_path}")
     return video_path
 
-def upload_video(video_path, plataforma, credentials):
+def upload_video(video_path, plataforma, credentials, youtube=None):
+    # Levanta exceção em caso de erro; as retentativas ficam a cargo do PipelineParalelo
     logging.info(f"Iniciando upload do vídeo: {video_path} para {plataforma}")
     try:
         if plataforma.lower() == 'youtube':
@@ -39,19 +47,38 @@ def upload_video(video_path, plataforma, credentials):
             tags = ["tag1", "tag2"]
             category_id = "22"  # Categoria de exemplo (22 = People & Blogs)
             privacy_status = "public"  # Ou "private", "unlisted"
-            upload_video_to_youtube(video_path, title, description, tags, category_id, privacy_status)
+            upload_video_to_youtube(video_path, title, description, tags, category_id, privacy_status, youtube=youtube)
         elif plataforma.lower() == 'tiktok':
             access_token = credentials.get('tiktok_access_token')
             if not access_token:
                 logging.error("Access token para TikTok não fornecido.")
                 return
             title = "Título do Vídeo"
-            upload_video_to_tiktok(video_path, access_token, title)
+            upload_video_to_tiktok(video_path, access_token, title, timeout=TIMEOUT_UPLOAD_S)
         else:
             logging.warning(f"Plataforma de upload '{plataforma}' não reconhecida.")
     except Exception as e:
         logging.error(f"Erro ao fazer upload do vídeo {video_path} para {plataforma}: {e}")
-        sys.exit(1)
+        raise
+
+def montar_etapas(credentials):
+    # Um cliente do YouTube por worker: o googleapiclient não é thread-safe
+    youtube = RecursoPorThread(criar_servico_youtube, timeout=TIMEOUT_UPLOAD_S)
+
+    def etapa_video(trabalho):
+        trabalho["video_path"] = criar_video(trabalho["tema"])
+
+    def etapa_upload_youtube(trabalho):
+        upload_video(trabalho["video_path"], 'youtube', credentials, youtube=youtube.obter())
+
+    def etapa_upload_tiktok(trabalho):
+        upload_video(trabalho["video_path"], 'tiktok', credentials)
+
+    return [
+        Etapa("video", etapa_video, WORKERS["video"], proximas=["upload_youtube", "upload_tiktok"]),
+        Etapa("upload_youtube", etapa_upload_youtube, WORKERS["upload_youtube"]),
+        Etapa("upload_tiktok", etapa_upload_tiktok, WORKERS["upload_tiktok"]),
+    ]
 
 def main():
     configurar_logging()
@@ -89,10 +116,21 @@ def main():
     }
 
     # Criar e fazer upload dos vídeos
+    pipeline = PipelineParalelo(montar_etapas(credentials), tentativas=TENTATIVAS, backoff_base=BACKOFF_BASE_S)
+    pipeline.iniciar()
     for tema in temas:
-        video_path = criar_video(tema)
-        upload_video(video_path, 'youtube', credentials)
-        upload_video(video_path, 'tiktok', credentials)
+        pipeline.enfileirar({"tema": tema})
+    pipeline.drenar()
+    pipeline.parar()
+
+    relatorio = pipeline.metricas.relatorio(0)
+    logging.info(
+        f"Vídeos: {relatorio['videos_concluidos']} concluídos, {relatorio['videos_parciais']} parciais, "
+        f"{relatorio['videos_falhos']} falhos."
+    )
+    if relatorio['videos_concluidos'] < relatorio['videos_emitidos']:
+        logging.error("Um ou mais vídeos não foram enviados para todas as plataformas.")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,407 @@
+# scripts/pipeline_paralelo.py
+"""
+Filas, workers e retentativas do pipeline de vídeos.
+
+Cada etapa tem sua fila e seu grupo de workers; um trabalho segue para as etapas em `proximas`
+quando a etapa termina com sucesso. É a mesma camada usada por main.py em produção e por
+scripts/teste_carga.py contra os serviços falsos.
+"""
+import math
+import time
+import queue
+import random
+import logging
+import itertools
+import threading
+
+import requests
+
+
+class ErroEtapa(Exception):
+    """
+    Falha de uma etapa do pipeline, com o tipo usado nas métricas de recuperação.
+    Erros com retentavel=False encerram a etapa sem novas tentativas.
+    """
+
+    def __init__(self, mensagem: str, tipo: str = "outro", retry_after: float = 0.0, retentavel: bool = True):
+        super().__init__(mensagem)
+        self.tipo = tipo
+        self.retry_after = retry_after
+        self.retentavel = retentavel
+
+
+def _ler_retry_after(valor) -> float:
+    """
+    Lê o cabeçalho Retry-After em segundos; formatos não numéricos (ex.: data HTTP) viram 0.
+    """
+    try:
+        return max(float(valor or 0), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _status_http(erro: Exception):
+    """
+    Extrai status e cabeçalhos HTTP de erros do requests (response) e do googleapiclient (resp).
+
+    :return: Tupla (status ou None, cabeçalhos).
+    """
+    resposta = getattr(erro, "response", None)
+    if resposta is not None and hasattr(resposta, "status_code"):
+        return resposta.status_code, resposta.headers
+    resp = getattr(erro, "resp", None)
+    if resp is not None and hasattr(resp, "status"):
+        return int(resp.status), resp
+    return None, {}
+
+
+def classificar_erro(erro: Exception) -> ErroEtapa:
+    """
+    Converte exceções das etapas (requests, googleapiclient, sockets) em ErroEtapa.
+
+    :param erro: Exceção levantada pela etapa.
+    :return: ErroEtapa com tipo '429', '5xx', '4xx', 'timeout', 'conexao' ou 'outro'.
+    """
+    if isinstance(erro, ErroEtapa):
+        return erro
+    status, cabecalhos = _status_http(erro)
+    if status is not None:
+        retry_after = _ler_retry_after(cabecalhos.get("Retry-After", cabecalhos.get("retry-after")))
+        if status == 429:
+            return ErroEtapa(str(erro), "429", retry_after)
+        if status >= 500:
+            return ErroEtapa(str(erro), "5xx", retry_after)
+        if status >= 400:
+            # Requisição rejeitada: repetir a mesma chamada não muda o resultado
+            return ErroEtapa(str(erro), "4xx", retry_after, retentavel=False)
+    if isinstance(erro, (requests.exceptions.Timeout, TimeoutError)):
+        return ErroEtapa(str(erro), "timeout")
+    if isinstance(erro, (requests.exceptions.ConnectionError, ConnectionError)):
+        return ErroEtapa(str(erro), "conexao")
+    return ErroEtapa(str(erro), "outro")
+
+
+def percentil(valores: list, p: float) -> float:
+    """
+    Percentil pelo método nearest-rank.
+
+    :param valores: Lista de amostras.
+    :param p: Percentil desejado, entre 0 e 100.
+    :return: Valor do percentil ou 0.0 se não houver amostras.
+    """
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = math.ceil(p / 100.0 * len(ordenados)) - 1
+    return ordenados[min(max(indice, 0), len(ordenados) - 1)]
+
+
+class Metricas:
+    """
+    Coleta thread-safe de latências, tentativas, falhas e profundidade das filas.
+    """
+
+    def __init__(self, etapas: list):
+        self.etapas = list(etapas)
+        self._lock = threading.Lock()
+        self.latencias = {etapa: [] for etapa in self.etapas}
+        self.esperas_fila = {etapa: [] for etapa in self.etapas}
+        self.latencias_ponta_a_ponta = []
+        self.instantes_conclusao = []
+        self.operacoes = {etapa: 0 for etapa in self.etapas}
+        self.tentativas = {etapa: 0 for etapa in self.etapas}
+        self.recuperadas = {etapa: 0 for etapa in self.etapas}
+        self.falhas = {etapa: 0 for etapa in self.etapas}
+        self.erros_por_tipo = {etapa: {} for etapa in self.etapas}
+        self.profundidade_filas = {etapa: [] for etapa in self.etapas}
+        self.videos_emitidos = 0
+        self.videos_concluidos = 0
+        self.videos_parciais = 0
+        self.videos_falhos = 0
+
+    def registrar_operacao(self, etapa: str, duracao: float, espera: float, tentativas: int, sucesso: bool):
+        with self._lock:
+            self.operacoes[etapa] += 1
+            self.tentativas[etapa] += tentativas
+            self.esperas_fila[etapa].append(espera)
+            if sucesso:
+                self.latencias[etapa].append(duracao)
+                if tentativas > 1:
+                    self.recuperadas[etapa] += 1
+            else:
+                self.falhas[etapa] += 1
+
+    def registrar_erro(self, etapa: str, tipo: str):
+        with self._lock:
+            self.erros_por_tipo[etapa][tipo] = self.erros_por_tipo[etapa].get(tipo, 0) + 1
+
+    def registrar_profundidades(self, filas: dict):
+        with self._lock:
+            for etapa, fila in filas.items():
+                self.profundidade_filas[etapa].append(fila.qsize())
+
+    def registrar_emissao(self):
+        with self._lock:
+            self.videos_emitidos += 1
+
+    def registrar_finalizacao(self, finais_ok: int, total_finais: int, duracao: float):
+        """
+        :param finais_ok: Etapas finais (sem `proximas`) concluídas com sucesso para o vídeo.
+        :param total_finais: Etapas finais que o vídeo deveria alcançar.
+        :param duracao: Tempo desde a emissão do vídeo, em segundos.
+        """
+        with self._lock:
+            if finais_ok == total_finais:
+                self.videos_concluidos += 1
+                self.latencias_ponta_a_ponta.append(duracao)
+                self.instantes_conclusao.append(time.monotonic())
+            elif finais_ok > 0:
+                self.videos_parciais += 1
+            else:
+                self.videos_falhos += 1
+
+    def relatorio(self, duracao_total: float) -> dict:
+        """
+        Consolida as métricas coletadas.
+
+        :param duracao_total: Tempo de parede da execução, em segundos.
+        :return: Dicionário serializável em JSON.
+        """
+        with self._lock:
+            # Sustentada: ritmo de conclusões entre o primeiro e o último vídeo concluído, sem o
+            # tempo de enchimento do pipeline nem a drenagem. Média: conclusões / duração total.
+            conclusoes = self.instantes_conclusao
+            janela = conclusoes[-1] - conclusoes[0] if len(conclusoes) > 1 else 0.0
+            vazao_sustentada = (len(conclusoes) - 1) / janela if janela > 0 else 0.0
+            vazao_media = self.videos_concluidos / duracao_total if duracao_total > 0 else 0.0
+            etapas = {}
+            for etapa in self.etapas:
+                amostras_fila = self.profundidade_filas[etapa]
+                etapas[etapa] = {
+                    "operacoes": self.operacoes[etapa],
+                    "tentativas": self.tentativas[etapa],
+                    "recuperadas_apos_retentativa": self.recuperadas[etapa],
+                    "falhas_definitivas": self.falhas[etapa],
+                    "erros_por_tipo": dict(self.erros_por_tipo[etapa]),
+                    "latencia_s": {
+                        "p50": percentil(self.latencias[etapa], 50),
+                        "p95": percentil(self.latencias[etapa], 95),
+                        "p99": percentil(self.latencias[etapa], 99),
+                        "max": max(self.latencias[etapa], default=0.0),
+                    },
+                    "espera_fila_s": {
+                        "p50": percentil(self.esperas_fila[etapa], 50),
+                        "p95": percentil(self.esperas_fila[etapa], 95),
+                    },
+                    "profundidade_fila": {
+                        "media": sum(amostras_fila) / len(amostras_fila) if amostras_fila else 0.0,
+                        "max": max(amostras_fila, default=0),
+                        "final": amostras_fila[-1] if amostras_fila else 0,
+                    },
+                }
+            return {
+                "duracao_s": duracao_total,
+                "videos_emitidos": self.videos_emitidos,
+                "videos_concluidos": self.videos_concluidos,
+                "videos_parciais": self.videos_parciais,
+                "videos_falhos": self.videos_falhos,
+                "videos_pendentes": self.videos_emitidos - self.videos_concluidos - self.videos_parciais - self.videos_falhos,
+                "vazao_sustentada_videos_por_minuto": vazao_sustentada * 60,
+                "vazao_sustentada_videos_por_dia": vazao_sustentada * 86400,
+                "vazao_media_total_videos_por_minuto": vazao_media * 60,
+                "ponta_a_ponta_s": {
+                    "p50": percentil(self.latencias_ponta_a_ponta, 50),
+                    "p95": percentil(self.latencias_ponta_a_ponta, 95),
+                    "p99": percentil(self.latencias_ponta_a_ponta, 99),
+                },
+                "etapas": etapas,
+            }
+
+
+class RecursoPorThread:
+    """
+    Cria um recurso por thread de worker, sob demanda (ex.: clientes googleapiclient, que não
+    são thread-safe), evitando recriá-lo a cada chamada.
+    """
+
+    def __init__(self, fabrica, *args, **kwargs):
+        self._fabrica = fabrica
+        self._args = args
+        self._kwargs = kwargs
+        self._local = threading.local()
+
+    def obter(self):
+        if not hasattr(self._local, "recurso"):
+            self._local.recurso = self._fabrica(*self._args, **self._kwargs)
+        return self._local.recurso
+
+
+class Etapa:
+    """
+    Etapa do pipeline.
+
+    :param nome: Nome da etapa (também usado nas métricas).
+    :param funcao: Função que recebe o dicionário do trabalho e o atualiza; deve levantar exceção em caso de falha.
+    :param workers: Número de threads consumindo a fila da etapa.
+    :param proximas: Etapas que recebem o trabalho após o sucesso desta.
+    """
+
+    def __init__(self, nome: str, funcao, workers: int = 1, proximas=()):
+        self.nome = nome
+        self.funcao = funcao
+        self.workers = workers
+        self.proximas = tuple(proximas)
+
+
+class PipelineParalelo:
+    """
+    Executa as etapas em paralelo, com uma fila por etapa e retentativas com backoff exponencial.
+    """
+
+    def __init__(self, etapas: list, tentativas: int = 3, backoff_base: float = 0.5, metricas: Metricas = None):
+        self.etapas = {etapa.nome: etapa for etapa in etapas}
+        self.primeira = etapas[0].nome
+        self.tentativas = tentativas
+        self.backoff_base = backoff_base
+        self.metricas = metricas or Metricas(list(self.etapas))
+        self.filas = {nome: queue.Queue() for nome in self.etapas}
+        self._finais = {nome: self._contar_finais(nome) for nome in self.etapas}
+        self._threads = []
+        self._parar = threading.Event()
+        self._ids = itertools.count()
+        self._lock_estados = threading.Lock()
+        self._estados = {}
+
+    def _contar_finais(self, nome: str) -> int:
+        proximas = self.etapas[nome].proximas
+        if not proximas:
+            return 1
+        return sum(self._contar_finais(proxima) for proxima in proximas)
+
+    def _executar_com_retentativas(self, etapa: str, funcao, trabalho: dict) -> int:
+        """
+        Executa a etapa com backoff exponencial, respeitando Retry-After quando presente.
+
+        :return: Número de tentativas usadas. Levanta ErroEtapa se todas falharem ou se o erro
+            não for retentável; o atributo 'tentativas' do erro guarda quantas foram feitas.
+        """
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                funcao(trabalho)
+                return tentativa
+            except Exception as e:
+                erro = classificar_erro(e)
+                self.metricas.registrar_erro(etapa, erro.tipo)
+                if tentativa == self.tentativas or not erro.retentavel:
+                    erro.tentativas = tentativa
+                    if erro is e:
+                        raise
+                    raise erro from e
+                espera = self.backoff_base * (2 ** (tentativa - 1)) + random.uniform(0, self.backoff_base)
+                time.sleep(max(espera, erro.retry_after))
+
+    def _colocar(self, etapa: str, trabalho: dict):
+        trabalho["enfileirado_em"][etapa] = time.monotonic()
+        self.filas[etapa].put(trabalho)
+
+    def _resolver(self, etapa: Etapa, trabalho: dict, sucesso: bool):
+        if sucesso and etapa.proximas:
+            for proxima in etapa.proximas:
+                self._colocar(proxima, trabalho)
+            return
+        # Sucesso numa etapa final, ou falha que encerra todos os ramos abaixo desta etapa
+        with self._lock_estados:
+            estado = self._estados[trabalho["id"]]
+            estado["restantes"] -= self._finais[etapa.nome]
+            estado["ok"] += int(sucesso)
+            if estado["restantes"] > 0:
+                return
+            del self._estados[trabalho["id"]]
+        self.metricas.registrar_finalizacao(
+            estado["ok"], self._finais[self.primeira], time.monotonic() - trabalho["criado_em"])
+
+    def _executar_trabalho(self, etapa: Etapa, trabalho: dict):
+        inicio = time.monotonic()
+        espera = inicio - trabalho["enfileirado_em"][etapa.nome]
+        try:
+            tentativas = self._executar_com_retentativas(etapa.nome, etapa.funcao, trabalho)
+            sucesso = True
+        except Exception as e:
+            tentativas = getattr(e, "tentativas", self.tentativas)
+            sucesso = False
+            if not self._parar.is_set():
+                logging.warning(f"Vídeo {trabalho['id']} falhou na etapa '{etapa.nome}' após {tentativas} tentativas: {e}")
+        self.metricas.registrar_operacao(etapa.nome, time.monotonic() - inicio, espera, tentativas, sucesso)
+        self._resolver(etapa, trabalho, sucesso)
+
+    def _worker(self, etapa: Etapa):
+        fila = self.filas[etapa.nome]
+        while True:
+            trabalho = fila.get()
+            try:
+                if trabalho is None:
+                    return
+                if self._parar.is_set():
+                    # Sobra após o tempo de drenagem: descarta, o vídeo segue como pendente
+                    continue
+                self._executar_trabalho(etapa, trabalho)
+            except Exception as e:
+                # Mantém o worker vivo; o vídeo fica como pendente no relatório
+                logging.error(f"Erro inesperado no worker da etapa '{etapa.nome}': {e}")
+            finally:
+                fila.task_done()
+
+    def _monitorar_filas(self, intervalo: float):
+        while not self._parar.wait(intervalo):
+            self.metricas.registrar_profundidades(self.filas)
+
+    def iniciar(self, intervalo_amostragem: float = 0.5):
+        for etapa in self.etapas.values():
+            for i in range(etapa.workers):
+                thread = threading.Thread(target=self._worker, args=(etapa,), name=f"{etapa.nome}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        monitor = threading.Thread(target=self._monitorar_filas, args=(intervalo_amostragem,), name="monitor-filas", daemon=True)
+        monitor.start()
+        self._threads.append(monitor)
+
+    def enfileirar(self, trabalho: dict = None) -> dict:
+        """
+        Coloca um novo trabalho na primeira etapa.
+
+        :param trabalho: Dados iniciais do trabalho (ex.: {"tema": ...}).
+        :return: O dicionário do trabalho, com 'id' e os tempos de controle preenchidos.
+        """
+        trabalho = dict(trabalho or {})
+        trabalho["id"] = next(self._ids)
+        trabalho["criado_em"] = time.monotonic()
+        trabalho["enfileirado_em"] = {}
+        with self._lock_estados:
+            self._estados[trabalho["id"]] = {"restantes": self._finais[self.primeira], "ok": 0}
+        self.metricas.registrar_emissao()
+        self._colocar(self.primeira, trabalho)
+        return trabalho
+
+    def drenar(self, tempo_limite: float = None) -> bool:
+        """
+        Aguarda as filas esvaziarem.
+
+        :param tempo_limite: Tempo máximo de espera, em segundos (None espera indefinidamente).
+        :return: True se todos os trabalhos foram processados dentro do tempo limite.
+        """
+        limite = None if tempo_limite is None else time.monotonic() + tempo_limite
+        while limite is None or time.monotonic() < limite:
+            if all(fila.unfinished_tasks == 0 for fila in self.filas.values()):
+                return True
+            time.sleep(0.1)
+        return False
+
+    def parar(self):
+        """
+        Encerra os workers. Itens ainda nas filas são descartados sem processamento.
+        """
+        self.metricas.registrar_profundidades(self.filas)
+        self._parar.set()
+        for etapa in self.etapas.values():
+            for _ in range(etapa.workers):
+                self.filas[etapa.nome].put(None)
@@ -0,0 +1,240 @@
+# scripts/servicos_falsos.py
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Rotas imitadas de cada serviço real usado pelo pipeline
+ROTA_GEMINI = "/v1beta/models/gemini-1.5-flash:generateContent"
+ROTA_TTS = "/tts"
+ROTA_YOUTUBE = "/upload/youtube/v3/videos"
+ROTA_TIKTOK = "/share/video/upload/"
+
+SERVICOS = ("gemini", "tts", "youtube", "tiktok")
+
+TEMAS_EXEMPLO = [
+    "The Unexpected Physics Of Sneezing",
+    "The Art of Minimalism",
+    "The Science Behind Whispering Galleries",
+    "Why Cats Always Land On Their Feet",
+    "How Octopuses Taste With Their Arms",
+]
+
+
+def _eh_numero(valor) -> bool:
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+class ComportamentoServico:
+    """
+    Latência, taxa de erro e limite de requisições de um serviço falso.
+    Levanta ValueError se algum valor estiver fora do intervalo aceito.
+    """
+
+    def __init__(self, latencia_ms=0, jitter_ms=0, taxa_erro=0.0, limite_por_segundo=0):
+        if not _eh_numero(latencia_ms) or latencia_ms < 0:
+            raise ValueError(f"latencia_ms deve ser um número >= 0 (recebido: {latencia_ms!r}).")
+        if not _eh_numero(jitter_ms) or jitter_ms < 0:
+            raise ValueError(f"jitter_ms deve ser um número >= 0 (recebido: {jitter_ms!r}).")
+        if not _eh_numero(taxa_erro) or not 0 <= taxa_erro <= 1:
+            raise ValueError(f"taxa_erro deve estar entre 0 e 1 (recebido: {taxa_erro!r}).")
+        if not isinstance(limite_por_segundo, int) or isinstance(limite_por_segundo, bool) or limite_por_segundo < 0:
+            raise ValueError(f"limite_por_segundo deve ser um inteiro >= 0 (recebido: {limite_por_segundo!r}).")
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.taxa_erro = taxa_erro
+        self.limite_por_segundo = limite_por_segundo
+
+    @classmethod
+    def de_dict(cls, dados: dict):
+        """
+        Cria o comportamento a partir de uma seção de configs/teste_carga.yaml.
+
+        :param dados: Dicionário com as chaves latencia_ms, jitter_ms, taxa_erro e limite_por_segundo.
+        :return: Instância de ComportamentoServico.
+        """
+        dados = dados or {}
+        return cls(
+            latencia_ms=dados.get("latencia_ms", 0),
+            jitter_ms=dados.get("jitter_ms", 0),
+            taxa_erro=dados.get("taxa_erro", 0.0),
+            limite_por_segundo=dados.get("limite_por_segundo", 0),
+        )
+
+    def sortear_latencia(self) -> float:
+        """
+        Retorna a latência (em segundos) de uma resposta, com jitter aleatório.
+        """
+        latencia = self.latencia_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(latencia, 0) / 1000.0
+
+
+class _LimitadorTaxa:
+    """
+    Janela fixa de um segundo: aceita até `limite` requisições por janela.
+    """
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self._lock = threading.Lock()
+        self._inicio_janela = time.monotonic()
+        self._contagem = 0
+
+    def permitir(self):
+        """
+        :return: Tupla (permitido, segundos até a próxima janela).
+        """
+        if self.limite <= 0:
+            return True, 0.0
+        with self._lock:
+            agora = time.monotonic()
+            if agora - self._inicio_janela >= 1.0:
+                self._inicio_janela = agora
+                self._contagem = 0
+            if self._contagem < self.limite:
+                self._contagem += 1
+                return True, 0.0
+            return False, 1.0 - (agora - self._inicio_janela)
+
+
+class _ManipuladorServicoFalso(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Silencia o log padrão do http.server; as métricas ficam no servidor
+        pass
+
+    def _ler_corpo(self) -> bytes:
+        tamanho = int(self.headers.get("Content-Length", 0) or 0)
+        return self.rfile.read(tamanho) if tamanho else b""
+
+    def _responder(self, status: int, corpo: bytes, tipo: str = "application/json", cabecalhos: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _responder_json(self, status: int, dados: dict, cabecalhos: dict = None):
+        self._responder(status, json.dumps(dados).encode("utf-8"), cabecalhos=cabecalhos)
+
+    def _simular(self) -> bool:
+        """
+        Aplica limite de taxa, latência e erros aleatórios.
+
+        :return: True se a requisição deve seguir para a rota, False se já foi respondida com erro.
+        """
+        servidor = self.server
+        comportamento = servidor.comportamento
+        servidor.registrar("requisicoes")
+
+        permitido, espera = servidor.limitador.permitir()
+        if not permitido:
+            servidor.registrar("limitadas")
+            self._responder_json(
+                429,
+                {"error": {"code": 429, "message": "Rate limit exceeded"}},
+                cabecalhos={"Retry-After": f"{max(espera, 0.05):.2f}"},
+            )
+            return False
+
+        time.sleep(comportamento.sortear_latencia())
+
+        if random.random() < comportamento.taxa_erro:
+            servidor.registrar("erros")
+            self._responder_json(500, {"error": {"code": 500, "message": "Internal error"}})
+            return False
+
+        servidor.registrar("sucessos")
+        return True
+
+    def do_POST(self):
+        corpo = self._ler_corpo()
+        if not self._simular():
+            return
+        nome = self.server.nome
+
+        if nome == "gemini" and self.path.startswith(ROTA_GEMINI):
+            tema = random.choice(TEMAS_EXEMPLO) + f" {uuid.uuid4().hex[:6]}"
+            self._responder_json(200, {"candidates": [{"content": {"parts": [{"text": tema}]}}]})
+        elif nome == "tts" and self.path.startswith(ROTA_TTS):
+            # Cabeçalho ID3 seguido de bytes proporcionais ao texto recebido
+            self._responder(200, b"ID3" + b"\x00" * max(len(corpo), 1), tipo="audio/mpeg")
+        elif nome == "youtube" and self.path.startswith(ROTA_YOUTUBE):
+            # Primeira etapa do upload resumable: devolve a URL da sessão
+            sessao = uuid.uuid4().hex
+            local = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}{ROTA_YOUTUBE}?upload_id={sessao}"
+            self._responder_json(200, {}, cabecalhos={"Location": local})
+        elif nome == "tiktok" and self.path.startswith(ROTA_TIKTOK):
+            self._responder_json(200, {"status_code": 0, "share_id": uuid.uuid4().hex})
+        else:
+            self._responder_json(404, {"error": {"code": 404, "message": f"Rota '{self.path}' não encontrada"}})
+
+    def do_PUT(self):
+        self._ler_corpo()
+        if not self._simular():
+            return
+        if self.server.nome == "youtube" and "upload_id=" in self.path:
+            self._responder_json(200, {"id": uuid.uuid4().hex[:11], "status": {"uploadStatus": "uploaded"}})
+        else:
+            self._responder_json(404, {"error": {"code": 404, "message": f"Rota '{self.path}' não encontrada"}})
+
+
+class ServicoFalso(ThreadingHTTPServer):
+    """
+    Servidor HTTP local que imita um serviço externo (Gemini, TTS, YouTube ou TikTok).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, nome: str, comportamento: ComportamentoServico, host: str = "127.0.0.1", porta: int = 0):
+        super().__init__((host, porta), _ManipuladorServicoFalso)
+        self.nome = nome
+        self.comportamento = comportamento
+        self.limitador = _LimitadorTaxa(comportamento.limite_por_segundo)
+        self.contadores = {"requisicoes": 0, "limitadas": 0, "erros": 0, "sucessos": 0}
+        self._lock_contadores = threading.Lock()
+        self._thread = None
+
+    @property
+    def url_base(self) -> str:
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def registrar(self, contador: str):
+        with self._lock_contadores:
+            self.contadores[contador] += 1
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self.serve_forever, name=f"servico-falso-{self.nome}", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+
+def iniciar_servicos_falsos(config_servicos: dict) -> dict:
+    """
+    Sobe um servidor falso para cada serviço configurado, em portas livres.
+
+    :param config_servicos: Seção 'servicos' de configs/teste_carga.yaml.
+    :return: Dicionário nome -> ServicoFalso já em execução.
+    """
+    servicos = {}
+    for nome in SERVICOS:
+        comportamento = ComportamentoServico.de_dict(config_servicos.get(nome))
+        servicos[nome] = ServicoFalso(nome, comportamento).iniciar()
+    return servicos
+
+
+def parar_servicos_falsos(servicos: dict):
+    for servico in servicos.values():
+        servico.parar()
@@ -0,0 +1,375 @@
+# scripts/teste_carga.py
+"""
+Teste de carga offline do pipeline (tema -> áudio -> vídeo -> YouTube/TikTok) contra serviços
+falsos locais (scripts/servicos_falsos.py).
+
+As filas, os workers e as retentativas são os de scripts/pipeline_paralelo.py, a mesma camada
+que main.py usa em produção. Os uploads chamam o código de produção: upload_video_to_youtube
+(googleapiclient apontado para o YouTube falso) e upload_video_to_tiktok.
+
+Etapas que continuam modeladas aqui, e por quê:
+- tema: scripts/generate_theme.py encerra o processo na importação sem GEMINI_API_KEY e
+  gerar_tema_unico engole qualquer exceção e devolve None, então não há erro para classificar
+  nem para retentar. O cliente abaixo faz a mesma chamada contra o Gemini falso.
+- áudio: criar_video.gerar_audio chama sys.exit(1) em qualquer erro e o gTTS fala apenas com
+  os servidores do Google. O cliente abaixo envia o texto para o TTS falso.
+- vídeo: a renderização do MoviePy depende do ImageMagick e é CPU local, sem serviço para
+  imitar; é simulada com o tempo e a taxa de erro de 'renderizacao'.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import tempfile
+
+import yaml
+import httplib2
+import requests
+from google.oauth2.credentials import Credentials
+
+from scripts.servicos_falsos import (
+    SERVICOS,
+    ROTA_GEMINI,
+    ROTA_TTS,
+    ROTA_TIKTOK,
+    ComportamentoServico,
+    iniciar_servicos_falsos,
+    parar_servicos_falsos,
+)
+from scripts.pipeline_paralelo import ErroEtapa, Etapa, Metricas, PipelineParalelo, RecursoPorThread
+from scripts import upload_tiktok, upload_youtube
+from scripts.upload_tiktok import upload_video_to_tiktok
+from scripts.upload_youtube import criar_servico_youtube, upload_video_to_youtube
+
+# Configuração básica de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler('teste_carga.log', mode='a', encoding='utf-8')
+    ]
+)
+
+CAMINHO_CONFIG_PADRAO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configs', 'teste_carga.yaml'
+)
+
+# Ordem das etapas: generate_theme -> gTTS -> criar_video -> upload_youtube / upload_tiktok
+ETAPAS = ["tema", "audio", "video", "upload_youtube", "upload_tiktok"]
+
+PROMPT_TEMA = (
+    "Provide a unique and interesting curiosity topic in English that has not been used before. "
+    "The topic should be concise and suitable for creating an educational video."
+)
+
+
+# ---------------------------------------------------------------------------
+# Clientes das etapas sem equivalente reutilizável em produção
+# ---------------------------------------------------------------------------
+
+def gerar_tema(url_base: str, timeout: float) -> str:
+    """
+    Equivalente a gerar_tema_unico (scripts/generate_theme.py) contra o Gemini falso.
+    """
+    resposta = requests.post(
+        f"{url_base}{ROTA_GEMINI}?key=teste-carga",
+        json={"contents": [{"parts": [{"text": PROMPT_TEMA}]}]},
+        timeout=timeout,
+    )
+    resposta.raise_for_status()
+    tema = resposta.json()["candidates"][0]["content"]["parts"][0]["text"].strip()
+    tema = re.sub(r'[^A-Za-z0-9\s\-]', '', tema).title()
+    if not tema:
+        raise ErroEtapa("Tema vazio retornado pelo Gemini.", retentavel=False)
+    return tema
+
+
+def gerar_audio(url_base: str, texto: str, caminho_audio: str, timeout: float):
+    """
+    Equivalente a gerar_audio (scripts/criar_video.py) contra o TTS falso.
+    """
+    resposta = requests.post(f"{url_base}{ROTA_TTS}", data={"q": texto, "tl": "pt"}, timeout=timeout)
+    resposta.raise_for_status()
+    with open(caminho_audio, 'wb') as f:
+        f.write(resposta.content)
+    if os.path.getsize(caminho_audio) == 0:
+        raise ErroEtapa(f"Arquivo de áudio '{caminho_audio}' não foi criado corretamente.")
+
+
+def renderizar_video(comportamento: ComportamentoServico, caminho_audio: str, caminho_video: str):
+    """
+    Simula a renderização do MoviePy (criar_video) com o tempo e a taxa de erro configurados.
+    """
+    time.sleep(comportamento.sortear_latencia())
+    if random.random() < comportamento.taxa_erro:
+        raise ErroEtapa("Falha simulada na renderização do vídeo.")
+    with open(caminho_audio, 'rb') as origem, open(caminho_video, 'wb') as destino:
+        destino.write(b"\x00\x00\x00\x18ftypmp42")
+        destino.write(origem.read())
+
+
+class _HttpServicoFalso(httplib2.Http):
+    """
+    Com api_endpoint, o googleapiclient troca só o host da URL de upload e mantém o esquema
+    https; o YouTube falso responde em HTTP puro, então o esquema é ajustado aqui.
+    """
+
+    def __init__(self, url_base: str, **kwargs):
+        super().__init__(**kwargs)
+        self._url_http = url_base
+        self._url_https = url_base.replace("http://", "https://", 1)
+
+    def request(self, uri, *args, **kwargs):
+        if uri.startswith(self._url_https):
+            uri = self._url_http + uri[len(self._url_https):]
+        return super().request(uri, *args, **kwargs)
+
+
+def criar_servico_youtube_falso(url_base: str, timeout: float):
+    """
+    Cliente real do YouTube (criar_servico_youtube) apontado para o serviço falso, com token estático.
+    """
+    return criar_servico_youtube(
+        credentials=Credentials(token="token-teste-carga"),
+        api_endpoint=url_base,
+        timeout=timeout,
+        http=_HttpServicoFalso(url_base),
+    )
+
+
+def montar_etapas(servicos: dict, config: dict, diretorio_trabalho: str) -> list:
+    """
+    Monta as etapas do pipeline ligadas aos serviços falsos.
+
+    :param servicos: Servidores retornados por iniciar_servicos_falsos.
+    :param config: Conteúdo de configs/teste_carga.yaml.
+    :param diretorio_trabalho: Diretório temporário para áudios e vídeos.
+    :return: Lista de Etapa para PipelineParalelo.
+    """
+    config_pipeline = config.get("pipeline", {})
+    workers = config_pipeline.get("workers", {})
+    timeout = config_pipeline.get("timeout_s", 30)
+    comportamento_render = ComportamentoServico.de_dict(config.get("renderizacao"))
+    youtube = RecursoPorThread(criar_servico_youtube_falso, servicos["youtube"].url_base, timeout)
+    url_tiktok = f"{servicos['tiktok'].url_base}{ROTA_TIKTOK}"
+
+    def caminho(trabalho: dict, extensao: str) -> str:
+        return os.path.join(diretorio_trabalho, f"video_{trabalho['id']}.{extensao}")
+
+    def etapa_tema(trabalho: dict):
+        trabalho["tema"] = gerar_tema(servicos["gemini"].url_base, timeout)
+
+    def etapa_audio(trabalho: dict):
+        trabalho["audio"] = caminho(trabalho, "mp3")
+        gerar_audio(servicos["tts"].url_base, trabalho["tema"], trabalho["audio"], timeout)
+
+    def etapa_video(trabalho: dict):
+        trabalho["video"] = caminho(trabalho, "mp4")
+        renderizar_video(comportamento_render, trabalho["audio"], trabalho["video"])
+
+    def etapa_upload_youtube(trabalho: dict):
+        upload_video_to_youtube(
+            trabalho["video"], trabalho["tema"], trabalho["tema"], [], "22", "private", youtube=youtube.obter())
+
+    def etapa_upload_tiktok(trabalho: dict):
+        upload_video_to_tiktok(trabalho["video"], "token-teste-carga", trabalho["tema"], timeout, url_tiktok)
+
+    return [
+        Etapa("tema", etapa_tema, workers.get("tema", 1), proximas=["audio"]),
+        Etapa("audio", etapa_audio, workers.get("audio", 1), proximas=["video"]),
+        Etapa("video", etapa_video, workers.get("video", 1), proximas=["upload_youtube", "upload_tiktok"]),
+        Etapa("upload_youtube", etapa_upload_youtube, workers.get("upload_youtube", 1)),
+        Etapa("upload_tiktok", etapa_upload_tiktok, workers.get("upload_tiktok", 1)),
+    ]
+
+
+def emitir(pipeline: PipelineParalelo, taxa_por_minuto: float, duracao: float):
+    """
+    Enfileira novos vídeos no pipeline a uma taxa constante.
+
+    :param pipeline: Pipeline já iniciado.
+    :param taxa_por_minuto: Vídeos por minuto a emitir.
+    :param duracao: Tempo de emissão, em segundos.
+    """
+    intervalo = 60.0 / taxa_por_minuto
+    inicio = time.monotonic()
+    proximo = inicio
+    contador = 0
+    while proximo - inicio < duracao:
+        time.sleep(max(proximo - time.monotonic(), 0))
+        pipeline.enfileirar()
+        contador += 1
+        # Agenda pelo relógio de início para não acumular atraso
+        proximo = inicio + contador * intervalo
+
+
+def carregar_config_teste(caminho: str) -> dict:
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        logging.error(f"Arquivo de configuração '{caminho}' não encontrado.")
+        sys.exit(1)
+    except yaml.YAMLError as e:
+        logging.error(f"Erro ao ler o arquivo YAML: {e}")
+        sys.exit(1)
+
+
+def validar_config(config: dict):
+    """
+    Interrompe a execução se algum valor de configs/teste_carga.yaml for inválido.
+
+    :param config: Configuração já com as sobrescritas da linha de comando.
+    """
+    for nome in SERVICOS:
+        try:
+            ComportamentoServico.de_dict(config.get("servicos", {}).get(nome))
+        except ValueError as e:
+            logging.error(f"servicos.{nome}: {e}")
+            sys.exit(1)
+    try:
+        ComportamentoServico.de_dict(config.get("renderizacao"))
+    except ValueError as e:
+        logging.error(f"renderizacao: {e}")
+        sys.exit(1)
+
+    config_pipeline = config.get("pipeline", {})
+    tentativas = config_pipeline.get("tentativas", 3)
+    if not isinstance(tentativas, int) or isinstance(tentativas, bool) or tentativas < 1:
+        logging.error(f"pipeline.tentativas deve ser um inteiro >= 1 (recebido: {tentativas!r}).")
+        sys.exit(1)
+    backoff_base = config_pipeline.get("backoff_base_s", 0.5)
+    if not isinstance(backoff_base, (int, float)) or isinstance(backoff_base, bool) or backoff_base < 0:
+        logging.error(f"pipeline.backoff_base_s deve ser um número >= 0 (recebido: {backoff_base!r}).")
+        sys.exit(1)
+    timeout = config_pipeline.get("timeout_s", 30)
+    if not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout <= 0:
+        logging.error(f"pipeline.timeout_s deve ser um número > 0 (recebido: {timeout!r}).")
+        sys.exit(1)
+    for etapa, quantidade in config_pipeline.get("workers", {}).items():
+        if etapa not in ETAPAS:
+            logging.error(f"Etapa desconhecida em pipeline.workers: '{etapa}'. Use uma de {ETAPAS}.")
+            sys.exit(1)
+        if not isinstance(quantidade, int) or isinstance(quantidade, bool) or quantidade < 1:
+            logging.error(f"pipeline.workers.{etapa} deve ser um inteiro >= 1 (recebido: {quantidade!r}).")
+            sys.exit(1)
+
+
+def imprimir_relatorio(relatorio: dict):
+    print()
+    print(f"Duração: {relatorio['duracao_s']:.1f}s")
+    print(
+        f"Vídeos: {relatorio['videos_emitidos']} emitidos, {relatorio['videos_concluidos']} concluídos, "
+        f"{relatorio['videos_parciais']} parciais, {relatorio['videos_falhos']} falhos, "
+        f"{relatorio['videos_pendentes']} pendentes"
+    )
+    print(
+        f"Vazão sustentada (entre a 1ª e a última conclusão): "
+        f"{relatorio['vazao_sustentada_videos_por_minuto']:.2f} vídeos/min "
+        f"(~{relatorio['vazao_sustentada_videos_por_dia']:.0f} vídeos/dia)"
+    )
+    print(
+        f"Vazão média na duração total (inclui enchimento e drenagem): "
+        f"{relatorio['vazao_media_total_videos_por_minuto']:.2f} vídeos/min"
+    )
+    ponta = relatorio["ponta_a_ponta_s"]
+    print(f"Ponta a ponta: p50={ponta['p50']:.2f}s p95={ponta['p95']:.2f}s p99={ponta['p99']:.2f}s")
+    print()
+    print("Latência e espera em segundos; profundidade da fila em itens.")
+    print(f"{'etapa':<16}{'ops':>6}{'tent.':>7}{'recup.':>8}{'falhas':>8}"
+          f"{'lat p50':>9}{'lat p95':>9}{'lat p99':>9}{'espera p95':>12}{'itens med':>11}{'itens max':>11}  erros")
+    for etapa, dados in relatorio["etapas"].items():
+        latencia = dados["latencia_s"]
+        fila = dados["profundidade_fila"]
+        erros = ", ".join(f"{tipo}={qtd}" for tipo, qtd in sorted(dados["erros_por_tipo"].items())) or "-"
+        print(
+            f"{etapa:<16}{dados['operacoes']:>6}{dados['tentativas']:>7}{dados['recuperadas_apos_retentativa']:>8}"
+            f"{dados['falhas_definitivas']:>8}{latencia['p50']:>8.2f}s{latencia['p95']:>8.2f}s{latencia['p99']:>8.2f}s"
+            f"{dados['espera_fila_s']['p95']:>11.2f}s{fila['media']:>11.1f}{fila['max']:>11}  {erros}"
+        )
+
+
+def main():
+    """
+    Executa o pipeline completo contra serviços locais falsos e imprime as métricas de carga.
+    """
+    parser = argparse.ArgumentParser(description="Teste de carga offline do pipeline de vídeos.")
+    parser.add_argument("--config", default=CAMINHO_CONFIG_PADRAO, help="Arquivo YAML com os parâmetros dos serviços falsos.")
+    parser.add_argument("--taxa", type=float, default=30.0, help="Vídeos emitidos por minuto.")
+    parser.add_argument("--duracao", type=float, default=60.0, help="Tempo de emissão, em segundos.")
+    parser.add_argument("--tempo-drenagem", type=float, default=120.0, help="Espera máxima para esvaziar as filas, em segundos.")
+    parser.add_argument("--workers", action="append", default=[], metavar="ETAPA=N", help="Sobrescreve o número de workers de uma etapa.")
+    parser.add_argument("--tentativas", type=int, help="Sobrescreve o número de tentativas por etapa.")
+    parser.add_argument("--saida-json", help="Salva o relatório em JSON neste caminho.")
+    parser.add_argument("--verbose", action="store_true", help="Mostra os logs INFO e os erros de cada tentativa dos uploaders do YouTube e do TikTok.")
+    args = parser.parse_args()
+    if args.taxa <= 0:
+        parser.error("--taxa deve ser maior que zero.")
+    if args.duracao <= 0:
+        parser.error("--duracao deve ser maior que zero.")
+    if args.tempo_drenagem <= 0:
+        parser.error("--tempo-drenagem deve ser maior que zero.")
+    if args.tentativas is not None and args.tentativas < 1:
+        parser.error("--tentativas deve ser maior ou igual a 1.")
+
+    config = carregar_config_teste(args.config)
+    config_pipeline = config.setdefault("pipeline", {})
+    workers = config_pipeline.setdefault("workers", {})
+    for item in args.workers:
+        etapa, _, quantidade = item.partition("=")
+        if etapa not in ETAPAS or not quantidade.isdigit() or int(quantidade) < 1:
+            parser.error(f"Valor inválido para --workers: '{item}'. Use ETAPA=N com ETAPA em {ETAPAS} e N >= 1.")
+        workers[etapa] = int(quantidade)
+    if args.tentativas is not None:
+        config_pipeline["tentativas"] = args.tentativas
+    validar_config(config)
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+        # Cada tentativa com erro já entra nas métricas; falhas definitivas são logadas pelo worker
+        upload_tiktok.logger.setLevel(logging.CRITICAL)
+        upload_youtube.logger.setLevel(logging.CRITICAL)
+
+    servicos = iniciar_servicos_falsos(config.get("servicos", {}))
+    diretorio_trabalho = tempfile.mkdtemp(prefix="teste_carga_")
+    metricas = Metricas(ETAPAS)
+    pipeline = PipelineParalelo(
+        montar_etapas(servicos, config, diretorio_trabalho),
+        tentativas=config_pipeline.get("tentativas", 3),
+        backoff_base=config_pipeline.get("backoff_base_s", 0.5),
+        metricas=metricas,
+    )
+
+    print(f"Emitindo {args.taxa:g} vídeos/min por {args.duracao:g}s (~{args.taxa * 1440:.0f} vídeos/dia)...")
+    inicio = time.monotonic()
+    try:
+        pipeline.iniciar()
+        emitir(pipeline, args.taxa, args.duracao)
+        if not pipeline.drenar(args.tempo_drenagem):
+            logging.warning(f"Filas não esvaziaram em {args.tempo_drenagem:g}s; há vídeos pendentes no relatório.")
+        duracao_total = time.monotonic() - inicio
+        pipeline.parar()
+        # O relatório é fechado antes de derrubar os serviços: trabalhos ainda em andamento
+        # contam apenas como pendentes, e não como falhas de conexão ou de arquivo.
+        relatorio = metricas.relatorio(duracao_total)
+        relatorio["servicos"] = {nome: dict(servico.contadores) for nome, servico in servicos.items()}
+    finally:
+        parar_servicos_falsos(servicos)
+        shutil.rmtree(diretorio_trabalho, ignore_errors=True)
+
+    imprimir_relatorio(relatorio)
+
+    if args.saida_json:
+        with open(args.saida_json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"\nRelatório salvo em: {args.saida_json}")
+
+
+if __name__ == "__main__":
+    main()
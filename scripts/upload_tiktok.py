@@ -2,32 +2,35 @@
 
 import logging
 import requests
-import os
 
-def upload_video_to_tiktok(video_path, access_token, title=""):
-    logging.info(f"Iniciando upload do vídeo {video_path} para o TikTok.")
+logger = logging.getLogger(__name__)
+
+TIKTOK_UPLOAD_URL = "https://open-api.tiktok.com/share/video/upload/"
+
+def upload_video_to_tiktok(video_path, access_token, title="", timeout=None, url=TIKTOK_UPLOAD_URL):
+    logger.info(f"Iniciando upload do vídeo {video_path} para o TikTok.")
 
-    url = "https://open-api.tiktok.com/share/video/upload/"
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
-    files = {
-        "video": open(video_path, "rb")
-    }
     data = {
         "title": title
     }
 
     try:
-        response = requests.post(url, headers=headers, files=files, data=data)
+        with open(video_path, "rb") as video_file:
+            files = {
+                "video": video_file
+            }
+            response = requests.post(url, headers=headers, files=files, data=data, timeout=timeout)
         response.raise_for_status()
         result = response.json()
         if result.get("status_code") == 0:
-            logging.info(f"Vídeo {video_path} enviado com sucesso para o TikTok.")
+            logger.info(f"Vídeo {video_path} enviado com sucesso para o TikTok.")
         else:
-            logging.error(f"Erro no upload para o TikTok: {result}")
+            logger.error(f"Erro no upload para o TikTok: {result}")
             raise Exception(result)
 
     except Exception as e:
-        logging.error(f"Erro durante o upload do vídeo para o TikTok: {e}")
+        logger.error(f"Erro durante o upload do vídeo para o TikTok: {e}")
         raise
@@ -2,21 +2,38 @@
 
 import logging
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, build_http
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 
-def upload_video_to_youtube(video_path, title, description, tags, category_id, privacy_status, token_file='token.json'):
-    logging.info(f"Iniciando upload do vídeo {video_path} para o YouTube.")
+logger = logging.getLogger(__name__)
 
-    # Carregar as credenciais do token.json
-    try:
-        creds = Credentials.from_authorized_user_file(token_file, scopes=["https://www.googleapis.com/auth/youtube.upload"])
-        logging.info("Credenciais carregadas com sucesso.")
-    except Exception as e:
-        logging.error(f"Erro ao carregar credenciais: {e}")
-        raise
+YOUTUBE_UPLOAD_SCOPES = ["https://www.googleapis.com/auth/youtube.upload"]
+
+def criar_servico_youtube(token_file='token.json', credentials=None, api_endpoint=None, timeout=None, http=None):
+    # Carregar as credenciais do token.json, se não forem fornecidas
+    if credentials is None:
+        try:
+            credentials = Credentials.from_authorized_user_file(token_file, scopes=YOUTUBE_UPLOAD_SCOPES)
+            logger.info("Credenciais carregadas com sucesso.")
+        except Exception as e:
+            logger.error(f"Erro ao carregar credenciais: {e}")
+            raise
+
+    # Mesmo transporte que o build() cria por padrão, com timeout opcional
+    if http is None:
+        http = build_http()
+    if timeout is not None:
+        http.timeout = timeout
+    client_options = {"api_endpoint": api_endpoint} if api_endpoint else None
+    return build('youtube', 'v3', http=AuthorizedHttp(credentials, http=http), client_options=client_options)
+
+def upload_video_to_youtube(video_path, title, description, tags, category_id, privacy_status, token_file='token.json', youtube=None):
+    logger.info(f"Iniciando upload do vídeo {video_path} para o YouTube.")
 
-    youtube = build('youtube', 'v3', credentials=creds)
+    # Reutiliza o cliente recebido; sem ele, carrega o token e monta um novo a cada chamada
+    if youtube is None:
+        youtube = criar_servico_youtube(token_file)
 
     try:
         request_body = {
@@ -43,10 +60,11 @@ def upload_video_to_youtube(video_path, title, description, tags, category_id, p
         while response is None:
             status, response = request.next_chunk()
             if status:
-                logging.info(f"Progresso do upload: {int(status.progress() * 100)}%")
+                logger.info(f"Progresso do upload: {int(status.progress() * 100)}%")
 
-        logging.info(f"Vídeo {video_path} enviado com sucesso. ID do Vídeo: {response.get('id')}")
+        logger.info(f"Vídeo {video_path} enviado com sucesso. ID do Vídeo: {response.get('id')}")
+        return response.get('id')
 
     except Exception as e:
-        logging.error(f"Erro durante o upload do vídeo para o YouTube: {e}")
+        logger.error(f"Erro durante o upload do vídeo para o YouTube: {e}")
         raise
@@ -0,0 +1,213 @@
+# tests/test_pipeline_paralelo.py
+import unittest
+from unittest import mock
+
+import requests
+
+from scripts.pipeline_paralelo import (
+    ErroEtapa,
+    Etapa,
+    Metricas,
+    PipelineParalelo,
+    _ler_retry_after,
+    classificar_erro,
+    percentil,
+)
+from scripts.servicos_falsos import ComportamentoServico, _LimitadorTaxa
+
+
+def _erro_http(status, retry_after=None):
+    resposta = requests.Response()
+    resposta.status_code = status
+    if retry_after is not None:
+        resposta.headers["Retry-After"] = retry_after
+    return requests.exceptions.HTTPError(f"{status}", response=resposta)
+
+
+class _RespostaGoogle(dict):
+    # Imita o httplib2.Response usado pelo HttpError do googleapiclient
+    def __init__(self, status, **cabecalhos):
+        super().__init__(cabecalhos)
+        self.status = status
+
+
+class _HttpErrorGoogle(Exception):
+    def __init__(self, resp):
+        super().__init__("HttpError")
+        self.resp = resp
+
+
+class TestPercentil(unittest.TestCase):
+    def test_nearest_rank(self):
+        valores = list(range(1, 101))
+        self.assertEqual(percentil(valores, 50), 50)
+        self.assertEqual(percentil(valores, 95), 95)
+        self.assertEqual(percentil(valores, 99), 99)
+        self.assertEqual(percentil(valores, 100), 100)
+        self.assertEqual(percentil(valores, 0), 1)
+        self.assertEqual(percentil(list(range(1, 11)), 50), 5)
+
+    def test_amostras_fora_de_ordem_e_vazias(self):
+        self.assertEqual(percentil([3, 1, 2], 50), 2)
+        self.assertEqual(percentil([7], 99), 7)
+        self.assertEqual(percentil([], 95), 0.0)
+
+
+class TestLimitadorTaxa(unittest.TestCase):
+    def test_janela_de_um_segundo(self):
+        with mock.patch("scripts.servicos_falsos.time.monotonic") as relogio:
+            relogio.return_value = 100.0
+            limitador = _LimitadorTaxa(2)
+            self.assertEqual(limitador.permitir(), (True, 0.0))
+            self.assertEqual(limitador.permitir(), (True, 0.0))
+            relogio.return_value = 100.25
+            permitido, espera = limitador.permitir()
+            self.assertFalse(permitido)
+            self.assertAlmostEqual(espera, 0.75)
+            relogio.return_value = 101.0
+            self.assertEqual(limitador.permitir(), (True, 0.0))
+
+    def test_sem_limite(self):
+        limitador = _LimitadorTaxa(0)
+        for _ in range(100):
+            self.assertTrue(limitador.permitir()[0])
+
+
+class TestComportamentoServico(unittest.TestCase):
+    def test_valores_invalidos(self):
+        for dados in ({"taxa_erro": 1.5}, {"latencia_ms": -1}, {"jitter_ms": -5}, {"limite_por_segundo": 2.5}):
+            with self.assertRaises(ValueError):
+                ComportamentoServico.de_dict(dados)
+
+    def test_latencia_nunca_negativa(self):
+        comportamento = ComportamentoServico(latencia_ms=10, jitter_ms=1000)
+        for _ in range(100):
+            self.assertGreaterEqual(comportamento.sortear_latencia(), 0)
+
+
+class TestClassificarErro(unittest.TestCase):
+    def test_ler_retry_after(self):
+        self.assertEqual(_ler_retry_after("1.5"), 1.5)
+        self.assertEqual(_ler_retry_after(None), 0.0)
+        self.assertEqual(_ler_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertEqual(_ler_retry_after("-3"), 0.0)
+
+    def test_erros_http_do_requests(self):
+        erro = classificar_erro(_erro_http(429, "2"))
+        self.assertEqual((erro.tipo, erro.retry_after, erro.retentavel), ("429", 2.0, True))
+        erro = classificar_erro(_erro_http(503))
+        self.assertEqual((erro.tipo, erro.retentavel), ("5xx", True))
+        erro = classificar_erro(_erro_http(404))
+        self.assertEqual((erro.tipo, erro.retentavel), ("4xx", False))
+        self.assertEqual(classificar_erro(_erro_http(429, "amanhã")).retry_after, 0.0)
+
+    def test_http_error_do_googleapiclient(self):
+        erro = classificar_erro(_HttpErrorGoogle(_RespostaGoogle(429, **{"retry-after": "0.5"})))
+        self.assertEqual((erro.tipo, erro.retry_after), ("429", 0.5))
+        self.assertEqual(classificar_erro(_HttpErrorGoogle(_RespostaGoogle(500))).tipo, "5xx")
+
+    def test_transporte_e_outros(self):
+        self.assertEqual(classificar_erro(requests.exceptions.ReadTimeout()).tipo, "timeout")
+        self.assertEqual(classificar_erro(TimeoutError()).tipo, "timeout")
+        self.assertEqual(classificar_erro(requests.exceptions.ConnectionError()).tipo, "conexao")
+        self.assertEqual(classificar_erro(ConnectionRefusedError()).tipo, "conexao")
+        self.assertEqual(classificar_erro(ValueError("x")).tipo, "outro")
+        original = ErroEtapa("x", retentavel=False)
+        self.assertIs(classificar_erro(original), original)
+
+
+class TestMetricas(unittest.TestCase):
+    def test_contagem_de_videos(self):
+        metricas = Metricas(["a"])
+        for _ in range(4):
+            metricas.registrar_emissao()
+        metricas.registrar_finalizacao(2, 2, 1.0)
+        metricas.registrar_finalizacao(1, 2, 1.0)
+        metricas.registrar_finalizacao(0, 2, 1.0)
+        relatorio = metricas.relatorio(10.0)
+        self.assertEqual(relatorio["videos_concluidos"], 1)
+        self.assertEqual(relatorio["videos_parciais"], 1)
+        self.assertEqual(relatorio["videos_falhos"], 1)
+        self.assertEqual(relatorio["videos_pendentes"], 1)
+        self.assertEqual(relatorio["vazao_media_total_videos_por_minuto"], 6.0)
+
+    def test_operacoes_e_recuperacao(self):
+        metricas = Metricas(["a"])
+        metricas.registrar_operacao("a", 0.5, 0.1, 1, True)
+        metricas.registrar_operacao("a", 0.7, 0.1, 3, True)
+        metricas.registrar_operacao("a", 0.9, 0.1, 3, False)
+        etapa = metricas.relatorio(1.0)["etapas"]["a"]
+        self.assertEqual(etapa["operacoes"], 3)
+        self.assertEqual(etapa["tentativas"], 7)
+        self.assertEqual(etapa["recuperadas_apos_retentativa"], 1)
+        self.assertEqual(etapa["falhas_definitivas"], 1)
+        self.assertEqual(etapa["latencia_s"]["max"], 0.7)
+
+
+class TestPipelineParalelo(unittest.TestCase):
+    def _executar(self, etapas, trabalhos, tentativas=3):
+        pipeline = PipelineParalelo(etapas, tentativas=tentativas, backoff_base=0)
+        pipeline.iniciar(intervalo_amostragem=0.01)
+        for trabalho in trabalhos:
+            pipeline.enfileirar(trabalho)
+        self.assertTrue(pipeline.drenar(5))
+        pipeline.parar()
+        return pipeline.metricas.relatorio(1.0)
+
+    def test_ramos_concluidos_parciais_e_falhos(self):
+        def origem(trabalho):
+            if trabalho["falha_origem"]:
+                raise ErroEtapa("origem", retentavel=False)
+
+        def destino_b(trabalho):
+            if trabalho["falha_b"]:
+                raise _erro_http(400)
+
+        etapas = [
+            Etapa("origem", origem, proximas=["a", "b"]),
+            Etapa("a", lambda trabalho: None),
+            Etapa("b", destino_b, workers=2),
+        ]
+        relatorio = self._executar(etapas, [
+            {"falha_origem": False, "falha_b": False},
+            {"falha_origem": False, "falha_b": True},
+            {"falha_origem": True, "falha_b": False},
+        ])
+        self.assertEqual(relatorio["videos_concluidos"], 1)
+        self.assertEqual(relatorio["videos_parciais"], 1)
+        self.assertEqual(relatorio["videos_falhos"], 1)
+        self.assertEqual(relatorio["videos_pendentes"], 0)
+        # 4xx não é retentado
+        self.assertEqual(relatorio["etapas"]["b"]["tentativas"], 2)
+        self.assertEqual(relatorio["etapas"]["origem"]["tentativas"], 3)
+
+    def test_recupera_apos_erro_transitorio(self):
+        chamadas = []
+
+        def instavel(trabalho):
+            chamadas.append(1)
+            if len(chamadas) == 1:
+                raise _erro_http(503)
+
+        relatorio = self._executar([Etapa("a", instavel)], [{}])
+        etapa = relatorio["etapas"]["a"]
+        self.assertEqual(relatorio["videos_concluidos"], 1)
+        self.assertEqual(etapa["tentativas"], 2)
+        self.assertEqual(etapa["recuperadas_apos_retentativa"], 1)
+        self.assertEqual(etapa["erros_por_tipo"], {"5xx": 1})
+
+    def test_erro_definitivo_preserva_a_causa(self):
+        pipeline = PipelineParalelo([Etapa("a", lambda trabalho: None)], tentativas=2, backoff_base=0)
+        original = _erro_http(500)
+
+        def sempre_falha(trabalho):
+            raise original
+
+        with self.assertRaises(ErroEtapa) as contexto:
+            pipeline._executar_com_retentativas("a", sempre_falha, {})
+        self.assertIs(contexto.exception.__cause__, original)
+        self.assertEqual(contexto.exception.tentativas, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()